@@ -1,9 +1,14 @@
 """
 Aggregator Module - Orchestrates the complete knowledge aggregation pipeline
 """
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import logging
-from search_engine import SearchEngine
+import threading
+import time
+from pathlib import Path
+from search_engine import SearchEngine, canonicalize_url
 from scraper_engine import ScraperEngine
 from summarizer import Summarizer
 from output_writer import OutputWriter
@@ -15,15 +20,79 @@ logger = logging.getLogger(__name__)
 class KnowledgeAggregator:
     """Main orchestrator for the Web Knowledge Aggregator Agent"""
     
+    __slots__ = (
+        "_search_engine",
+        "_scraper_engine",
+        "_summarizer",
+        "_output_writer",
+        "_components_lock",
+        "_missing_config",
+        "_llm_slots",
+        "_cache",
+        "_cache_lock",
+        "_in_flight",
+    )
+    
     def __init__(self):
-        """Initialize all components"""
-        self.search_engine = SearchEngine()
-        self.scraper_engine = ScraperEngine()
-        self.summarizer = Summarizer()
-        self.output_writer = OutputWriter()
+        """Initialize the aggregator; pipeline components are created on first use"""
+        Config.ensure_loaded()
+        
+        self._search_engine: Optional[SearchEngine] = None
+        self._scraper_engine: Optional[ScraperEngine] = None
+        self._summarizer: Optional[Summarizer] = None
+        self._output_writer: Optional[OutputWriter] = None
+        self._components_lock = threading.Lock()
+        
+        # Names of required settings that are not set (Config does not change at runtime)
+        required_configs = (
+            ("AZURE_OPENAI_API_KEY", Config.AZURE_OPENAI_API_KEY),
+            ("AZURE_OPENAI_ENDPOINT", Config.AZURE_OPENAI_ENDPOINT),
+        )
+        self._missing_config = [name for name, value in required_configs if not value]
+        
+        # Bounds concurrent Azure OpenAI work across pipelines and parallel topics
+        self._llm_slots = threading.Semaphore(Config.LLM_CONCURRENCY)
+        
+        # LRU cache of completed results keyed by (normalized topic, max_results),
+        # each stored with its expiry time
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Topics being processed right now; concurrent callers wait for the same result
+        self._in_flight: Dict[Tuple[str, int], Future] = {}
         
         logger.info("Knowledge Aggregator initialized")
     
+    def _component(self, slot: str, factory):
+        """Return the component stored in slot, constructing it on first use"""
+        component = getattr(self, slot)
+        if component is None:
+            with self._components_lock:
+                component = getattr(self, slot)
+                if component is None:
+                    component = factory()
+                    setattr(self, slot, component)
+        return component
+    
+    @property
+    def search_engine(self) -> SearchEngine:
+        """Search engine, constructed on first use"""
+        return self._component("_search_engine", SearchEngine)
+    
+    @property
+    def scraper_engine(self) -> ScraperEngine:
+        """Scraper engine, constructed on first use"""
+        return self._component("_scraper_engine", ScraperEngine)
+    
+    @property
+    def summarizer(self) -> Summarizer:
+        """Summarizer (Azure OpenAI client and prompts), constructed on first use"""
+        return self._component("_summarizer", Summarizer)
+    
+    @property
+    def output_writer(self) -> OutputWriter:
+        """Report writer, constructed on first use"""
+        return self._component("_output_writer", OutputWriter)
+    
     def validate_config(self) -> bool:
         """
         Validate that all required configuration is present
@@ -31,18 +100,8 @@ class KnowledgeAggregator:
         Returns:
             True if configuration is valid
         """
-        required_configs = [
-            Config.AZURE_OPENAI_API_KEY,
-            Config.AZURE_OPENAI_ENDPOINT,
-        ]
-        
-        missing_configs = []
-        for config in required_configs:
-            if not config:
-                missing_configs.append(config)
-        
-        if missing_configs:
-            logger.error(f"Missing required configuration: {missing_configs}")
+        if self._missing_config:
+            logger.error(f"Missing required configuration: {', '.join(self._missing_config)}")
             return False
         
         return True
@@ -69,6 +128,26 @@ class KnowledgeAggregator:
         logger.info(f"Search completed: {len(search_results)} results found")
         return search_results
     
+    def _extract_urls(self, search_results: List[Dict[str, str]]) -> List[str]:
+        """Extract URLs from search results, dropping duplicates (web and news
+        searches often return the same page) while preserving order; the
+        original hrefs are returned, canonical forms only serve as keys"""
+        urls = {}
+        for result in search_results:
+            if result.get('href'):
+                key = result.get('canonical_href') or canonicalize_url(result['href'])
+                urls.setdefault(key, result['href'])
+        return list(urls.values())
+    
+    def _empty_summary(self, topic: str) -> Dict[str, Any]:
+        """Summary data for a topic without any content"""
+        return {
+            "topic": topic,
+            "articles": [],
+            "final_insights": "No content available for summarization.",
+            "total_articles": 0
+        }
+    
     def scrape_content(self, search_results: List[Dict[str, str]]) -> List[Dict[str, str]]:
         """
         Scrape content from search results
@@ -81,14 +160,13 @@ class KnowledgeAggregator:
         """
         logger.info("Starting content scraping")
         
-        # Extract URLs from search results
-        urls = [result['href'] for result in search_results if result.get('href')]
+        urls = self._extract_urls(search_results)
         
         if not urls:
             logger.warning("No URLs found in search results")
             return []
         
-        # Scrape content
+        # Scrape content (concurrently, see ScraperEngine.scrape_multiple)
         scraped_content = self.scraper_engine.scrape_multiple(urls)
         
         logger.info(f"Scraping completed: {len(scraped_content)} articles scraped")
@@ -107,48 +185,146 @@ class KnowledgeAggregator:
         """
         logger.info("Starting content summarization")
         
-        if not scraped_content:
+        # Summarize articles concurrently (short and duplicate ones are skipped),
+        # then generate the topic insights
+        summarized_articles = self.summarizer.summarize_multiple_articles(scraped_content, self._llm_slots)
+        
+        if not summarized_articles:
             logger.warning("No content to summarize")
-            return {
-                "topic": topic,
-                "articles": [],
-                "final_insights": "No content available for summarization.",
-                "total_articles": 0
-            }
+            return self._empty_summary(topic)
         
-        # Create topic summary
-        summary_data = self.summarizer.create_topic_summary(topic, scraped_content)
+        with self._llm_slots:
+            summary_data = self.summarizer.compile_topic_summary(topic, summarized_articles)
         
         logger.info(f"Summarization completed: {len(summary_data['articles'])} articles summarized")
         return summary_data
     
-    def generate_report(self, summary_data: Dict[str, Any], filename: Optional[str] = None) -> str:
+    def scrape_and_summarize(self, topic: str, search_results: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        Scrape and summarize as a pipeline: each article is handed to the
+        summarizer as soon as it is scraped, so LLM calls overlap the
+        remaining downloads instead of waiting for the slowest URL
+        
+        Args:
+            topic: Original search topic
+            search_results: List of search results with URLs
+            
+        Returns:
+            Tuple of (scraped articles, summary data)
+        """
+        logger.info("Starting scrape and summarize pipeline")
+        
+        urls = self._extract_urls(search_results)
+        
+        if not urls:
+            logger.warning("No URLs found in search results")
+            return [], self._empty_summary(topic)
+        
+        scraped: Dict[int, Dict[str, str]] = {}
+        
+        with ThreadPoolExecutor(max_workers=min(Config.SCRAPE_CONCURRENCY, len(urls))) as scrape_pool:
+            scrape_futures = {
+                scrape_pool.submit(self.scraper_engine.scrape_url, url): i
+                for i, url in enumerate(urls)
+            }
+            
+            def arrivals():
+                for future in as_completed(scrape_futures):
+                    article = future.result()
+                    if article:
+                        scraped[scrape_futures[future]] = article
+                        yield article
+            
+            # The summarizer consumes articles as they are scraped, through the same
+            # filtering and concurrency as any other article list
+            summarized_articles = self.summarizer.summarize_multiple_articles(arrivals(), self._llm_slots)
+        
+        # Restore search result order
+        scraped_content = [scraped[i] for i in sorted(scraped)]
+        position = {url: i for i, url in enumerate(urls)}
+        summarized_articles.sort(key=lambda article: position.get(article['url'], len(urls)))
+        
+        logger.info(f"Scraping completed: {len(scraped_content)} articles scraped")
+        
+        if not summarized_articles:
+            logger.warning("No content to summarize")
+            return scraped_content, self._empty_summary(topic)
+        
+        with self._llm_slots:
+            summary_data = self.summarizer.compile_topic_summary(topic, summarized_articles)
+        
+        logger.info(f"Summarization completed: {len(summary_data['articles'])} articles summarized")
+        return scraped_content, summary_data
+    
+    def generate_report(self, summary_data: Dict[str, Any], filename: Optional[str] = None,
+                        content: Optional[str] = None) -> str:
         """
         Generate and save the final report
         
         Args:
             summary_data: Summary data from summarization
             filename: Optional custom filename
+            content: Already rendered Markdown to write instead of rendering it again
             
         Returns:
             Path to the saved report
         """
         logger.info("Generating final report")
         
-        # Save markdown report
-        report_path = self.output_writer.save_report(summary_data, filename)
-        
-        # Save JSON backup
-        json_path = self.output_writer.save_json_backup(summary_data)
+        # Save the markdown report and the JSON backup concurrently (independent writes)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            report_future = executor.submit(self.output_writer.save_report, summary_data, filename, content)
+            json_future = executor.submit(self.output_writer.save_json_backup, summary_data)
+            
+            report_path = report_future.result()
+            json_path = json_future.result()
         
         logger.info(f"Report generation completed: {report_path}")
         return report_path
     
+    def _cache_key(self, topic: str, max_results: Optional[int]) -> Tuple[str, int]:
+        """Key under which a topic's result is cached"""
+        return (topic.lower().strip(), max_results or Config.MAX_SEARCH_RESULTS)
+    
+    def _lookup_result(self, key: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+        """Return an unexpired cached result and mark it as recently used (lock held)"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        
+        self._cache.move_to_end(key)
+        return result
+    
+    def _get_cached_result(self, key: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+        """Return an unexpired cached result and mark it as recently used"""
+        with self._cache_lock:
+            return self._lookup_result(key)
+    
+    def _cache_result(self, key: Tuple[str, int], result: Dict[str, Any]):
+        """Store a completed result, evicting the least recently used one"""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + Config.RESULT_CACHE_TTL, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > Config.RESULT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
     def process_topic(self, topic: str, max_results: Optional[int] = None, 
                      output_filename: Optional[str] = None) -> Dict[str, Any]:
         """
         Complete end-to-end processing pipeline
         
+        Results are cached per (topic, max_results) for Config.RESULT_CACHE_TTL
+        seconds, so repeating a topic skips search, scraping and summarization.
+        A topic that is already being processed is not started again: the
+        caller waits for the running pipeline and shares its result. Every
+        caller gets its own shallow copy of the result dict; the nested
+        summary_data is shared and must be treated as read-only.
+        
         Args:
             topic: Topic to research
             max_results: Maximum number of search results
@@ -163,69 +339,140 @@ class KnowledgeAggregator:
         if not self.validate_config():
             raise ValueError("Invalid configuration - check Azure OpenAI settings")
         
-        try:
-            # Step 1: Search
-            search_results = self.search_topic(topic, max_results)
-            
-            # Step 2: Scrape
-            scraped_content = self.scrape_content(search_results)
-            
-            # Step 3: Summarize
-            summary_data = self.summarize_content(topic, scraped_content)
-            
-            # Step 4: Generate report
-            report_path = self.generate_report(summary_data, output_filename)
-            
-            # Generate quick summary for console
-            quick_summary = self.output_writer.generate_quick_summary(summary_data)
+        cache_key = self._cache_key(topic, max_results)
+        cached = self._get_cached_result(cache_key)
+        if cached is None:
+            # Either run the pipeline or wait for the caller already running it
+            with self._cache_lock:
+                cached = self._lookup_result(cache_key)
+                future = self._in_flight.get(cache_key)
+                owner = cached is None and future is None
+                if owner:
+                    future = self._in_flight[cache_key] = Future()
             
-            result = {
-                "topic": topic,
-                "status": "completed",
-                "report_path": report_path,
-                "total_articles": summary_data['total_articles'],
-                "search_results_count": len(search_results),
-                "scraped_articles_count": len(scraped_content),
-                "quick_summary": quick_summary,
-                "summary_data": summary_data
-            }
+            if owner:
+                try:
+                    result = self._run_pipeline(topic, max_results, output_filename)
+                    self._cache_result(cache_key, result)
+                    future.set_result(result)
+                    return {**result}
+                except Exception as e:
+                    future.set_exception(e)
+                    logger.error(f"Processing failed for topic '{topic}': {str(e)}")
+                    raise
+                finally:
+                    with self._cache_lock:
+                        del self._in_flight[cache_key]
             
-            logger.info(f"Processing completed successfully for topic: {topic}")
-            return result
+            if cached is None:
+                logger.info(f"Waiting for in-progress processing of topic: {topic}")
+                cached = future.result()
+        
+        logger.info(f"Using cached result for topic: {topic}")
+        
+        # Only write a new report when a different filename is requested
+        if output_filename is not None:
+            report_name = output_filename if output_filename.endswith('.md') else f"{output_filename}.md"
+            if Path(cached['report_path']).name != report_name:
+                report_path = self.generate_report(cached['summary_data'], output_filename)
+                return {**cached, "report_path": report_path}
+        
+        return {**cached}
+    
+    def _run_pipeline(self, topic: str, max_results: Optional[int],
+                      output_filename: Optional[str]) -> Dict[str, Any]:
+        """
+        Search, scrape, summarize and write the report for one topic
+        
+        Args:
+            topic: Topic to research
+            max_results: Maximum number of search results
+            output_filename: Optional custom output filename
             
-        except Exception as e:
-            logger.error(f"Processing failed for topic '{topic}': {str(e)}")
-            raise
+        Returns:
+            Processing results with paths and summary
+        """
+        # Step 1: Search
+        search_results = self.search_topic(topic, max_results)
+        
+        # Steps 2 & 3: Scrape and summarize (pipelined)
+        scraped_content, summary_data = self.scrape_and_summarize(topic, search_results)
+        
+        # Step 4: Generate report
+        report_path = self.generate_report(summary_data, output_filename)
+        
+        # Generate quick summary for console
+        quick_summary = self.output_writer.generate_quick_summary(summary_data)
+        
+        result = {
+            "topic": topic,
+            "status": "completed",
+            "report_path": report_path,
+            "total_articles": summary_data['total_articles'],
+            "search_results_count": len(search_results),
+            "scraped_articles_count": len(scraped_content),
+            "quick_summary": quick_summary,
+            "summary_data": summary_data
+        }
+        
+        logger.info(f"Processing completed successfully for topic: {topic}")
+        return result
     
-    def process_multiple_topics(self, topics: List[str], max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+    def process_multiple_topics(self, topics: List[str], max_results: Optional[int] = None,
+                                on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
         """
-        Process multiple topics in sequence
+        Process multiple topics concurrently
         
         Args:
             topics: List of topics to research
             max_results: Maximum number of search results per topic
+            on_result: Optional callback invoked with each result as its topic finishes
             
         Returns:
-            List of processing results
+            List of processing results, in the same order as topics
         """
         logger.info(f"Starting processing for {len(topics)} topics")
         
-        results = []
+        if not topics:
+            return []
         
+        results: List[Optional[Dict[str, Any]]] = [None] * len(topics)
+        completed = 0
+        
+        # Topics that differ only in case or whitespace share one pipeline run
+        positions: Dict[Tuple[str, int], List[int]] = {}
         for i, topic in enumerate(topics):
-            logger.info(f"Processing topic {i+1}/{len(topics)}: {topic}")
+            positions.setdefault(self._cache_key(topic, max_results), []).append(i)
+        
+        max_workers = min(Config.TOPIC_CONCURRENCY, len(positions))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.process_topic, topics[indices[0]], max_results): indices
+                for indices in positions.values()
+            }
             
-            try:
-                result = self.process_topic(topic, max_results)
-                results.append(result)
+            for future in as_completed(futures):
+                indices = futures[future]
+                topic = topics[indices[0]]
+                
+                try:
+                    result = future.result()
+                    completed += len(indices)
+                    logger.info(f"Completed topic {completed}/{len(topics)}: {topic}")
+                    
+                except Exception as e:
+                    completed += len(indices)
+                    logger.error(f"Failed to process topic '{topic}': {str(e)}")
+                    result = {
+                        "topic": topic,
+                        "status": "failed",
+                        "error": str(e)
+                    }
                 
-            except Exception as e:
-                logger.error(f"Failed to process topic '{topic}': {str(e)}")
-                results.append({
-                    "topic": topic,
-                    "status": "failed",
-                    "error": str(e)
-                })
+                for i in indices:
+                    results[i] = {**result}
+                    if on_result is not None:
+                        on_result(result)
         
         logger.info(f"Multi-topic processing completed: {len(results)} results")
         return results
@@ -253,7 +500,7 @@ class KnowledgeAggregator:
             },
             "components": {
                 "search_engine": "DuckDuckGo",
-                "scraper_engine": "newspaper3k + BeautifulSoup",
+                "scraper_engine": "newspaper3k + lxml",
                 "summarizer": "LangChain + Azure OpenAI",
                 "output_writer": "Markdown + JSON"
             }
@@ -2,26 +2,24 @@
 Configuration settings for Web Knowledge Aggregator Agent
 """
 import os
+import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent.absolute()
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables from .env file in the script directory
 env_file = SCRIPT_DIR / ".env"
-if env_file.exists():
+ENV_FILE_FOUND = env_file.exists()
+if ENV_FILE_FOUND:
+    # Exported variables take precedence: load_dotenv never overrides them
     load_dotenv(env_file)
-    print(f"✅ Loaded environment from: {env_file}")
-else:
-    print(f"⚠️ .env file not found at: {env_file}")
-    print("💡 Please create a .env file with your Azure OpenAI credentials")
-    print("   Example .env file content:")
-    print("   AZURE_OPENAI_API_KEY=your_api_key_here")
-    print("   AZURE_OPENAI_ENDPOINT=https://your-resource.openai.azure.com/")
 
 class Config:
-    """Application configuration"""
+    """Application configuration (environment values are resolved once, at import)"""
     
     # Azure OpenAI Configuration
     AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
@@ -32,20 +30,64 @@ class Config:
     # Search Configuration
     MAX_SEARCH_RESULTS = 10
     SEARCH_TIMEOUT = 30
+    SEARCH_RATE_LIMIT_CALLS = 2  # DuckDuckGo requests allowed per period (burst size)
+    SEARCH_RATE_LIMIT_PERIOD = 4.0  # Seconds
     
     # Scraping Configuration
     SCRAPING_TIMEOUT = 15
     MAX_CONTENT_LENGTH = 10000
     MIN_CONTENT_LENGTH = 100
+    SCRAPE_CONCURRENCY = 8
+    SCRAPE_PER_HOST_LIMIT = 2  # Concurrent requests to any single host
+    # Worker processes for fallback HTML parsing; 1 parses in-thread. Each worker re-imports the
+    # scraper (newspaper, nltk), which only pays off when newspaper fails on many large pages
+    PARSE_PROCESSES = 1
     
     # Summarization Configuration
-    CHUNK_SIZE = 4000
-    CHUNK_OVERLAP = 200
+    CHUNK_SIZE = 2000  # Tokens summarized in one prompt; longer texts are split for map-reduce
+    CHUNK_OVERLAP = 100  # Tokens shared by consecutive chunks
     MAX_SUMMARY_LENGTH = 500
+    CONTEXT_WINDOW = 4096  # Tokens the deployment accepts (prompt + completion)
+    # Article tokens kept by extractive distillation. Must exceed CHUNK_SIZE, otherwise no text is
+    # ever long enough for LONG_DOC_STRATEGY; texts are also capped by CONTEXT_WINDOW before chunking
+    DISTILL_MAX_TOKENS = 3000
+    INSIGHTS_MAX_TOKENS = 3000  # Budget for all article summaries in the final insights prompt
+    INSIGHTS_TOP_K = 10  # Most topic-relevant summaries passed to the final insights prompt
+    LONG_DOC_STRATEGY = "extract_then_stuff"  # Texts over CHUNK_SIZE: "extract_then_stuff", "refine" or "map_reduce"
+    NEAR_DUPLICATE_THRESHOLD = 0.85  # Shingle Jaccard similarity above which articles count as copies
+    
+    # Concurrency Configuration
+    TOPIC_CONCURRENCY = 4
+    LLM_CONCURRENCY = 4  # Concurrent Azure OpenAI pipelines, size to the deployment's TPM budget
+    LLM_MAX_RETRIES = 5  # Client-side retries (with backoff) on rate limits and transient errors
+    LLM_TIMEOUT = 60  # Seconds before a single Azure OpenAI request is abandoned (and retried)
+    
+    # Caching Configuration
+    RESULT_CACHE_SIZE = 32  # Completed topics kept in memory per aggregator
+    RESULT_CACHE_TTL = 60 * 60  # Seconds a completed topic is reused before it is researched again
+    SUMMARY_CACHE_SIZE = 1024  # Article summaries kept in memory, reused for identical distilled text
+    SUMMARY_CACHE_DIR = Path("output") / ".summary_cache"  # Persistent copy, survives restarts and reruns
+    SCRAPE_CACHE_DIR = Path("output") / ".scrape_cache"
+    SCRAPE_CACHE_TTL = 24 * 60 * 60  # Seconds a scraped page is reused
     
     # Output Configuration
-    OUTPUT_DIR = Path("output")
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    OUTPUT_DIR = Path("output")  # Created on first write by OutputWriter
+    COMPRESS_JSON_BACKUP = True  # Write backups as zstd-compressed .json.zst when zstandard is installed
     
     # User Agent for web scraping
-    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
\ No newline at end of file
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    
+    _load_reported = False
+    
+    @classmethod
+    def ensure_loaded(cls):
+        """Report where the environment was loaded from (once per process)"""
+        if cls._load_reported:
+            return
+        cls._load_reported = True
+        
+        if ENV_FILE_FOUND:
+            logger.info(f"Loaded environment from: {env_file}")
+        else:
+            logger.warning(f".env file not found at: {env_file}")
+            logger.warning("Please create a .env file with AZURE_OPENAI_API_KEY and AZURE_OPENAI_ENDPOINT")
@@ -0,0 +1,288 @@
+"""
+Distiller Module - Shrinks article text to its most informative sentences before summarization
+"""
+from typing import Dict, FrozenSet, List, Optional
+from collections import Counter
+from functools import lru_cache
+import hashlib
+import math
+import re
+import logging
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Global variable for tiktoken availability
+TIKTOKEN_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    logger.warning("tiktoken not available, token counts will be estimated")
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_WORD_RE = re.compile(r'\w+')
+
+# Words too common to say anything about a sentence's content
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could for from had has have he her his how i if in into is it
+its more most not of on or our she so than that the their them then there these they this those to
+was we were what when where which who will with would you your
+""".split())
+
+@lru_cache(maxsize=None)
+def get_encoder():
+    """Return the shared tiktoken encoder (loaded once per process), or None"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text
+    
+    Args:
+        text: Text to measure
+    
+    Returns:
+        Token count (estimated at ~4 characters per token without tiktoken)
+    """
+    encoder = get_encoder()
+    if encoder is None:
+        return len(text) // 4 + 1
+    return len(encoder.encode_ordinary(text))
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut text to at most max_tokens tokens
+    
+    Args:
+        text: Text to shorten
+        max_tokens: Token budget
+    
+    Returns:
+        The text itself if it fits, otherwise its leading max_tokens tokens
+    """
+    encoder = get_encoder()
+    if encoder is None:
+        return text if count_tokens(text) <= max_tokens else text[:max_tokens * 4]
+    
+    ids = encoder.encode_ordinary(text)
+    return text if len(ids) <= max_tokens else encoder.decode(ids[:max_tokens])
+
+def split_tokens(text: str, chunk_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    Split text into chunks of at most chunk_tokens tokens, encoding it only once
+    
+    Args:
+        text: Text to split
+        chunk_tokens: Maximum tokens per chunk
+        overlap_tokens: Tokens repeated at the start of the next chunk
+    
+    Returns:
+        List of chunks ([text] when it already fits)
+    """
+    encoder = get_encoder()
+    # Never let the overlap exceed half a chunk, or the text would be re-sent many times
+    step = max(1, chunk_tokens - min(overlap_tokens, chunk_tokens // 2))
+    
+    if encoder is None:
+        # Same ~4 characters per token estimate as count_tokens
+        if count_tokens(text) <= chunk_tokens:
+            return [text]
+        return [text[i:i + chunk_tokens * 4] for i in range(0, len(text), step * 4)]
+    
+    ids = encoder.encode_ordinary(text)
+    if len(ids) <= chunk_tokens:
+        return [text]
+    return [encoder.decode(ids[i:i + chunk_tokens]) for i in range(0, len(ids), step)]
+
+def shingles(text: str, size: int = 5) -> FrozenSet[int]:
+    """
+    Hash every run of `size` consecutive words in a text
+    
+    Args:
+        text: Text to shingle
+        size: Words per shingle
+    
+    Returns:
+        Set of shingle hashes (valid within this process only)
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return frozenset([hash(tuple(words))])
+    return frozenset(hash(tuple(words[i:i + size])) for i in range(len(words) - size + 1))
+
+def is_near_duplicate(candidate: FrozenSet[int], others: List[FrozenSet[int]], threshold: float) -> bool:
+    """True if a shingle set's Jaccard similarity to any of `others` reaches the threshold"""
+    return any(len(candidate & other) >= threshold * len(candidate | other) for other in others)
+
+def drop_near_duplicates(articles: List[Dict[str, str]], threshold: float,
+                         field: str = 'text') -> List[Dict[str, str]]:
+    """
+    Drop articles whose text is a near copy of another one (mirrors, syndication)
+    
+    Similarity is the Jaccard index of 5-word shingle sets; of each group of
+    copies the longest text is kept. Exact pairwise comparison is cheap at the
+    handful of articles a topic yields, so no MinHash/LSH approximation is needed.
+    
+    Args:
+        articles: Articles with a text field
+        threshold: Similarity at or above which two articles are copies
+        field: Field to compare ('text' for scraped bodies, 'summary' for summaries)
+    
+    Returns:
+        Remaining articles, in input order
+    """
+    if len(articles) < 2:
+        return articles
+    
+    kept: List[int] = []
+    kept_shingles: List[FrozenSet[int]] = []
+    for i in sorted(range(len(articles)), key=lambda i: len(articles[i].get(field, '')), reverse=True):
+        candidate = shingles(articles[i].get(field, ''))
+        if is_near_duplicate(candidate, kept_shingles, threshold):
+            continue
+        kept.append(i)
+        kept_shingles.append(candidate)
+    
+    if len(kept) < len(articles):
+        logger.info(f"Dropped {len(articles) - len(kept)} near-duplicate articles")
+    
+    return [articles[i] for i in sorted(kept)]
+
+class ContentFilter:
+    """
+    Admits articles worth summarizing, one at a time as they arrive
+    
+    An article is rejected when its text is shorter than Config.MIN_CONTENT_LENGTH,
+    identical to an admitted one, or a near copy of one (shingle Jaccard at or
+    above Config.NEAR_DUPLICATE_THRESHOLD). The first copy of a page wins.
+    """
+    
+    def __init__(self):
+        self.min_length = Config.MIN_CONTENT_LENGTH
+        self.threshold = Config.NEAR_DUPLICATE_THRESHOLD
+        self._digests = set()
+        self._shingles: List[FrozenSet[int]] = []
+    
+    def admit(self, text: str) -> bool:
+        """
+        Check an article's text and remember it if admitted
+        
+        Args:
+            text: Article text
+        
+        Returns:
+            True if the article should be summarized
+        """
+        if len(text) < self.min_length:
+            return False
+        
+        # Exact copies are caught by a hash before the costlier shingle comparison
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        if digest in self._digests:
+            return False
+        
+        candidate = shingles(text)
+        if is_near_duplicate(candidate, self._shingles, self.threshold):
+            return False
+        
+        self._digests.add(digest)
+        self._shingles.append(candidate)
+        return True
+
+def top_relevant(query: str, texts: List[str], k: int) -> List[int]:
+    """
+    Pick the k texts that mention the query's content words most often
+    
+    Args:
+        query: Search topic
+        texts: Candidate texts
+        k: Number of texts to keep
+    
+    Returns:
+        Indices of the kept texts, in input order
+    """
+    if len(texts) <= k:
+        return list(range(len(texts)))
+    
+    terms = {w for w in _WORD_RE.findall(query.lower()) if w not in _STOPWORDS}
+    
+    def score(text: str) -> float:
+        # Topic hits damped by sqrt(word count): longer, substantive texts are not
+        # penalized in proportion to their length, but padding does not win either
+        words = _WORD_RE.findall(text.lower())
+        return sum(1 for w in words if w in terms) / math.sqrt(len(words) or 1)
+    
+    scores = [score(text) for text in texts]
+    # sorted() is stable, so ties keep the search engine's order
+    return sorted(sorted(range(len(texts)), key=lambda i: scores[i], reverse=True)[:k])
+
+class Distiller:
+    """Extractive pre-summarization step that keeps the highest-scoring sentences"""
+    
+    def __init__(self, max_tokens: Optional[int] = None):
+        self.max_tokens = max_tokens or Config.DISTILL_MAX_TOKENS
+    
+    def _score_sentences(self, sentences: List[str]) -> List[float]:
+        """
+        Score sentences by the average document frequency of their content words
+        
+        Args:
+            sentences: Sentences of one article
+        
+        Returns:
+            One score per sentence
+        """
+        sentence_words = [
+            [w for w in _WORD_RE.findall(sentence.lower()) if w not in _STOPWORDS and len(w) > 2]
+            for sentence in sentences
+        ]
+        frequencies = Counter(w for words in sentence_words for w in words)
+        
+        return [
+            sum(frequencies[w] for w in words) / len(words) if words else 0.0
+            for words in sentence_words
+        ]
+    
+    def distill(self, text: str) -> str:
+        """
+        Reduce text to its top-scoring sentences within the token budget
+        
+        Args:
+            text: Article text
+        
+        Returns:
+            Distilled text, sentences kept in their original order
+        """
+        original_tokens = count_tokens(text)
+        if original_tokens <= self.max_tokens:
+            return text
+        
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+        scores = self._score_sentences(sentences)
+        
+        # Greedily take the best sentences that still fit the budget
+        selected = []
+        budget = self.max_tokens
+        for i in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+            tokens = count_tokens(sentences[i])
+            if tokens <= budget:
+                selected.append(i)
+                budget -= tokens
+            if budget <= 0:
+                break
+        
+        if not selected:
+            # No sentence fits on its own (e.g. text without punctuation)
+            return truncate_tokens(text, self.max_tokens)
+        
+        distilled = ' '.join(sentences[i] for i in sorted(selected))
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Distilled %d -> %d tokens", original_tokens, count_tokens(distilled))
+        
+        return distilled
@@ -6,7 +6,9 @@ Example Usage Scripts for Web Knowledge Aggregator Agent
 import os
 import json
 from pathlib import Path
+from collections import Counter
 from datetime import datetime
+from statistics import fmean
 
 # Import the aggregator
 from aggregator import KnowledgeAggregator
@@ -176,18 +178,14 @@ def example_5_data_analysis():
             print(f"\n📚 Article Analysis:")
             
             # Count by extraction method
-            methods = {}
-            for article in summary_data['articles']:
-                method = article.get('method', 'unknown')
-                methods[method] = methods.get(method, 0) + 1
+            methods = Counter(article.get('method', 'unknown') for article in summary_data['articles'])
             
             print(f"   Extraction methods:")
             for method, count in methods.items():
                 print(f"     {method}: {count} articles")
             
-            # Average summary length
-            summary_lengths = [len(article['summary']) for article in summary_data['articles']]
-            avg_length = sum(summary_lengths) / len(summary_lengths)
+            # Average summary length (single pass over a generator)
+            avg_length = fmean(len(article['summary']) for article in summary_data['articles'])
             print(f"   Average summary length: {avg_length:.0f} characters")
             
             # Show first few titles
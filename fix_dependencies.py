@@ -7,10 +7,10 @@ import sys
 import os
 
 def run_command(command, description):
-    """Run a command and handle errors"""
+    """Run a command (argument list, no shell) and handle errors"""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -35,8 +35,11 @@ def main():
         "langsmith"
     ]
     
-    for package in packages_to_remove:
-        run_command(f"pip uninstall -y {package}", f"Uninstalling {package}")
+    # A single pip invocation for all packages instead of one process per package
+    run_command(
+        [sys.executable, "-m", "pip", "uninstall", "-y", *packages_to_remove],
+        f"Uninstalling {', '.join(packages_to_remove)}"
+    )
     
     # Step 2: Install working versions
     print("\n📦 Step 2: Installing working versions...")
@@ -50,15 +53,21 @@ def main():
         "langchain-core"
     ]
     
-    for package in core_packages:
-        if not run_command(f"pip install {package}", f"Installing {package}"):
-            print(f"❌ Failed to install {package}")
-            return False
+    # Install together so the resolver runs once
+    if not run_command(
+        [sys.executable, "-m", "pip", "install", *core_packages],
+        f"Installing {', '.join(core_packages)}"
+    ):
+        print("❌ Failed to install core packages")
+        return False
     
     # Step 3: Install remaining dependencies
     print("\n📦 Step 3: Installing remaining dependencies...")
     
-    if not run_command("pip install -r requirements.txt", "Installing all dependencies"):
+    if not run_command(
+        [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+        "Installing all dependencies"
+    ):
         print("❌ Failed to install requirements")
         return False
     
@@ -6,8 +6,9 @@ import argparse
 import sys
 import json
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import logging
+import logging.handlers
 
 from aggregator import KnowledgeAggregator
 from config import Config
@@ -15,13 +16,25 @@ from config import Config
 def setup_logging(verbose: bool = False):
     """Setup logging configuration"""
     level = logging.DEBUG if verbose else logging.INFO
+    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    
+    # Buffer log file writes; records are flushed in batches, on errors and at exit
+    log_file = logging.FileHandler('knowledge_aggregator.log')
+    log_file.setFormatter(logging.Formatter(log_format))
+    file_handler = logging.handlers.MemoryHandler(
+        capacity=100,
+        flushLevel=logging.ERROR,
+        target=log_file
+    )
+    
     logging.basicConfig(
         level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format=log_format,
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler('knowledge_aggregator.log')
-        ]
+            file_handler
+        ],
+        force=True  # Modules call basicConfig at import time; replace those defaults
     )
 
 def print_banner():
@@ -86,6 +99,13 @@ def process_single_topic(topic: str, max_results: Optional[int] = None,
         print(f"❌ Error: {str(e)}")
         sys.exit(1)
 
+def print_topic_result(result: Dict[str, Any]):
+    """Print the outcome of one topic from a multi-topic run"""
+    if result['status'] == 'completed':
+        print(f"\n📄 {result['topic']}: {result['report_path']}")
+    else:
+        print(f"\n❌ {result['topic']}: {result.get('error', 'Unknown error')}")
+
 def process_multiple_topics(topics: List[str], max_results: Optional[int] = None, 
                            verbose: bool = False):
     """Process multiple topics"""
@@ -106,8 +126,8 @@ def process_multiple_topics(topics: List[str], max_results: Optional[int] = None
         print(f"📊 Max results per topic: {max_results or Config.MAX_SEARCH_RESULTS}")
         print("=" * 50)
         
-        # Process topics
-        results = aggregator.process_multiple_topics(topics, max_results)
+        # Process topics concurrently, printing each result as its topic finishes
+        results = aggregator.process_multiple_topics(topics, max_results, on_result=print_topic_result)
         
         # Print summary
         successful = sum(1 for r in results if r['status'] == 'completed')
@@ -118,13 +138,6 @@ def process_multiple_topics(topics: List[str], max_results: Optional[int] = None
         print(f"✅ Successful: {successful}")
         print(f"❌ Failed: {failed}")
         
-        # Print individual results
-        for result in results:
-            if result['status'] == 'completed':
-                print(f"\n📄 {result['topic']}: {result['report_path']}")
-            else:
-                print(f"\n❌ {result['topic']}: {result.get('error', 'Unknown error')}")
-        
     except Exception as e:
         logger.error(f"Multi-topic processing failed: {str(e)}")
         print(f"❌ Error: {str(e)}")
@@ -162,8 +175,13 @@ def show_system_status():
     else:
         print("  ❌ Missing required environment variables")
 
-def main():
-    """Main entry point"""
+def main(argv: Optional[List[str]] = None):
+    """
+    Main entry point
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(
         description="Web Knowledge Aggregator Agent - Search, scrape, and summarize web content",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -221,7 +239,7 @@ Examples:
         help="Run in interactive mode"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Handle different modes
     if args.status:
@@ -4,19 +4,81 @@ Output Writer Module - Generates clean Markdown reports
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
+from functools import lru_cache
+from itertools import chain
+import re
 import logging
+import orjson
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Global variable for zstandard availability
+ZSTD_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    logger.debug("zstandard not available, JSON backups will be written uncompressed")
+
+_UNSAFE_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=2048)
+def _sanitize_filename(filename: str) -> str:
+    """Memoized implementation of OutputWriter.sanitize_filename"""
+    # Remove or replace problematic characters
+    filename = _UNSAFE_CHARS_RE.sub('-', filename)
+    filename = _WHITESPACE_RE.sub('-', filename)
+    filename = filename.strip('-')
+    
+    # Limit length
+    if len(filename) > 100:
+        filename = filename[:100]
+    
+    return filename
+
+# Values shown for fields an article does not provide
+ARTICLE_DEFAULTS = {
+    'title': 'No title',
+    'url': '',
+    'summary': 'No summary available',
+    'authors': 'Unknown',
+    'publish_date': 'Unknown',
+    'method': 'Unknown',
+}
+
+ARTICLE_SECTION_TEMPLATE = """## 📰 {title}
+
+**Source:** {url}  
+**Authors:** {authors}  
+**Published:** {publish_date}  
+**Extraction Method:** {method}  
+
+### Summary
+{summary}
+
+---
+
+"""
+
 class OutputWriter:
     """Generates formatted Markdown reports"""
     
+    # Set once the output directory is known to exist
+    _dir_ready = False
+    
     def __init__(self):
         self.output_dir = Config.OUTPUT_DIR
-        self.output_dir.mkdir(exist_ok=True)
+    
+    def _ensure_output_dir(self):
+        """Create the output directory on first write"""
+        if not OutputWriter._dir_ready:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            OutputWriter._dir_ready = True
     
     def sanitize_filename(self, filename: str) -> str:
         """
@@ -28,17 +90,7 @@ class OutputWriter:
         Returns:
             Sanitized filename
         """
-        # Remove or replace problematic characters
-        import re
-        filename = re.sub(r'[<>:"/\\|?*]', '-', filename)
-        filename = re.sub(r'\s+', '-', filename)
-        filename = filename.strip('-')
-        
-        # Limit length
-        if len(filename) > 100:
-            filename = filename[:100]
-        
-        return filename
+        return _sanitize_filename(filename)
     
     def format_article_section(self, article: Dict[str, str]) -> str:
         """
@@ -50,37 +102,21 @@ class OutputWriter:
         Returns:
             Formatted Markdown section
         """
-        title = article.get('title', 'No title')
-        url = article.get('url', '')
-        summary = article.get('summary', 'No summary available')
-        authors = article.get('authors', 'Unknown')
-        publish_date = article.get('publish_date', 'Unknown')
-        method = article.get('method', 'Unknown')
-        
-        section = f"""## 📰 {title}
-
-**Source:** {url}  
-**Authors:** {authors}  
-**Published:** {publish_date}  
-**Extraction Method:** {method}  
-
-### Summary
-{summary}
-
----
-
-"""
-        return section
+        # One merge and one format call instead of a .get() per field
+        return ARTICLE_SECTION_TEMPLATE.format_map({**ARTICLE_DEFAULTS, **article})
     
-    def generate_markdown_report(self, summary_data: Dict[str, Any]) -> str:
+    def _iter_report_chunks(self, summary_data: Dict[str, Any]) -> Iterator[str]:
         """
-        Generate complete Markdown report
+        Lazily produce the Markdown report piece by piece
+        
+        The summary fields are read up front so a malformed summary fails before
+        anything is written; article sections are only formatted when consumed.
         
         Args:
             summary_data: Dictionary with topic, articles, and insights
             
         Returns:
-            Complete Markdown report as string
+            Iterator over the report's text chunks
         """
         topic = summary_data['topic']
         articles = summary_data['articles']
@@ -91,7 +127,7 @@ class OutputWriter:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Header
-        report = f"""# 🌐 Web Knowledge Aggregator Report
+        header = f"""# 🌐 Web Knowledge Aggregator Report
 
 ## Topic: {topic}
 
@@ -103,27 +139,8 @@ class OutputWriter:
 
 """
         
-        # Add table of contents
-        if articles:
-            report += """## 📋 Table of Contents
-
-"""
-            for i, article in enumerate(articles, 1):
-                title = article.get('title', 'No title')
-                report += f"{i}. [{title}](#{self.sanitize_filename(title).lower()})\n"
-            
-            report += "\n---\n\n"
-        
-        # Add individual article sections
-        if articles:
-            report += """## 📚 Article Summaries
-
-"""
-            for article in articles:
-                report += self.format_article_section(article)
-        
-        # Add final insights
-        report += f"""## 💡 Final Insights
+        # Final insights and statistics
+        footer = f"""## 💡 Final Insights
 
 {final_insights}
 
@@ -141,15 +158,48 @@ class OutputWriter:
 *This report was generated automatically by the Web Knowledge Aggregator Agent.*
 """
         
-        return report
+        if not articles:
+            return iter((header, footer))
+        
+        # TOC anchors, computed once per article (sanitizing is memoized across reports)
+        titles = [article.get('title', 'No title') for article in articles]
+        slugs = [self.sanitize_filename(title).lower() for title in titles]
+        
+        return chain(
+            (header, """## 📋 Table of Contents
+
+"""),
+            # Table of contents
+            (f"{i}. [{title}](#{slug})\n" for i, (title, slug) in enumerate(zip(titles, slugs), 1)),
+            ("\n---\n\n", """## 📚 Article Summaries
+
+"""),
+            # Individual article sections
+            (self.format_article_section(article) for article in articles),
+            (footer,)
+        )
+    
+    def generate_markdown_report(self, summary_data: Dict[str, Any]) -> str:
+        """
+        Generate complete Markdown report
+        
+        Args:
+            summary_data: Dictionary with topic, articles, and insights
+            
+        Returns:
+            Complete Markdown report as string
+        """
+        return "".join(self._iter_report_chunks(summary_data))
     
-    def save_report(self, summary_data: Dict[str, Any], filename: Optional[str] = None) -> str:
+    def save_report(self, summary_data: Dict[str, Any], filename: Optional[str] = None,
+                    content: Optional[str] = None) -> str:
         """
         Save the report to a Markdown file
         
         Args:
             summary_data: Dictionary with topic, articles, and insights
             filename: Optional custom filename
+            content: Already rendered report (see generate_markdown_report); streamed from summary_data if omitted
             
         Returns:
             Path to the saved file
@@ -168,13 +218,14 @@ class OutputWriter:
         
         file_path = self.output_dir / filename
         
-        # Generate report content
-        report_content = self.generate_markdown_report(summary_data)
+        # Generate report content (unless the caller already rendered it)
+        report_chunks = (content,) if content is not None else self._iter_report_chunks(summary_data)
         
-        # Save to file
+        # Stream to file, section by section, instead of building the whole report first
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(report_content)
+            self._ensure_output_dir()
+            with open(file_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                f.writelines(report_chunks)
             
             logger.info(f"Report saved to: {file_path}")
             return str(file_path)
@@ -192,10 +243,8 @@ class OutputWriter:
             filename: Optional custom filename
             
         Returns:
-            Path to the saved JSON file
+            Path to the saved JSON file (.json.zst when compressed)
         """
-        import json
-        
         topic = summary_data['topic']
         
         # Generate filename if not provided
@@ -204,16 +253,31 @@ class OutputWriter:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{sanitized_topic}_{timestamp}_backup.json"
         
-        # Ensure .json extension
+        compress = Config.COMPRESS_JSON_BACKUP and ZSTD_AVAILABLE
+        
+        # Ensure .json (or .json.zst) extension
+        if filename.endswith('.zst'):
+            filename = filename[:-len('.zst')]
         if not filename.endswith('.json'):
             filename += '.json'
+        if compress:
+            filename += '.zst'
         
         file_path = self.output_dir / filename
         
         # Save to JSON file
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(summary_data, f, indent=2, ensure_ascii=False)
+            self._ensure_output_dir()
+            data = orjson.dumps(summary_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            
+            if compress:
+                # Article texts compress several-fold, so far fewer bytes hit the disk.
+                # One-shot compress() records the content size in the frame header,
+                # which zstandard.decompress() needs (stream_writer frames lack it)
+                compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+                file_path.write_bytes(compressor.compress(data))
+            else:
+                file_path.write_bytes(data)
             
             logger.info(f"JSON backup saved to: {file_path}")
             return str(file_path)
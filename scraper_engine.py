@@ -1,10 +1,23 @@
 """
-Scraper Engine Module - Extracts content from web pages using newspaper3k and BeautifulSoup
+Scraper Engine Module - Extracts content from web pages using newspaper3k and lxml
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from newspaper import Article
-from bs4 import BeautifulSoup
-from typing import Dict, Optional, List
+from lxml import etree, html as lxml_html
+from typing import Dict, Optional, List, Tuple, TypedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit
+import atexit
+import hashlib
+import multiprocessing
+import orjson
+import os
+import tempfile
+import threading
 import time
 import logging
 from config import Config
@@ -12,6 +25,108 @@ from config import Config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ScrapedArticle(TypedDict):
+    """Article fields produced by the scraper (the summarizer adds summary/distilled_text)"""
+    title: str
+    text: str
+    authors: str
+    publish_date: str
+    url: str
+    method: str
+
+# Main-content containers, most specific first
+CONTENT_TAGS = ('article', 'main')
+CONTENT_CLASSES = ('content', 'post-content', 'entry-content', 'article-content', 'story-body')
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching a whole class token (like the CSS .name selector)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Compiled once: every candidate container in a single document-order traversal
+_CONTENT_XPATH = etree.XPath(' | '.join(
+    [f'//{tag}' for tag in CONTENT_TAGS] + [f'//*[{_has_class(c)}]' for c in CONTENT_CLASSES]
+))
+_BOILERPLATE_XPATH = etree.XPath('//script | //style | //nav | //footer | //header')
+_TITLE_XPATH = etree.XPath('string(//title)')
+_TEXT_XPATH = etree.XPath('.//text()')
+
+def _content_rank(element) -> int:
+    """Priority of a _CONTENT_XPATH match (lower is better)"""
+    ranks = [CONTENT_TAGS.index(element.tag)] if element.tag in CONTENT_TAGS else []
+    classes = (element.get('class') or '').split()
+    ranks.extend(len(CONTENT_TAGS) + CONTENT_CLASSES.index(c) for c in classes if c in CONTENT_CLASSES)
+    return min(ranks, default=len(CONTENT_TAGS) + len(CONTENT_CLASSES))
+
+def _parse_html(page: bytes) -> Optional[Tuple[str, str]]:
+    """
+    Extract the title and main text of an HTML page
+    
+    Kept at module level so it can run in a worker process. Parse errors are
+    handled here: lxml exceptions carry an error log that cannot be pickled
+    back to the calling process.
+    
+    Args:
+        page: Raw page bytes
+        
+    Returns:
+        (title, whitespace-normalized text), or None if the page has no content
+        element or cannot be parsed
+    """
+    try:
+        return _extract_content(page)
+    except Exception as e:
+        logger.warning(f"HTML parsing failed: {str(e)}")
+        return None
+
+def _extract_content(page: bytes) -> Optional[Tuple[str, str]]:
+    """Parse a page and pick its main content element (see _parse_html)"""
+    tree = lxml_html.document_fromstring(page)
+    
+    # Remove script, style and navigation elements; drop_tree() merges their tail
+    # text into the preceding text, so keep a word boundary in front of it
+    for element in _BOILERPLATE_XPATH(tree):
+        if element.tail:
+            element.tail = ' ' + element.tail
+        element.drop_tree()
+    
+    # Extract title
+    title = _TITLE_XPATH(tree).strip() or "No title"
+    
+    # Extract main content, keeping selector priority among the matches
+    matches = _CONTENT_XPATH(tree)
+    content = min(matches, key=_content_rank) if matches else None
+    
+    if content is None:
+        # Fallback to body
+        content = tree.find('body')
+    
+    if content is None:
+        return None
+    
+    # Extract text and clean up extra whitespace
+    text = ' '.join(_TEXT_XPATH(content))
+    return title, ' '.join(text.split())
+
+@lru_cache(maxsize=None)
+def _get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the shared HTML parsing process pool, or None to parse in the calling thread
+    
+    The pool is first requested from scraper worker threads, and forking a
+    multithreaded process can deadlock the child, so workers are started
+    from a forkserver (or spawned where that is unavailable).
+    """
+    if Config.PARSE_PROCESSES <= 1:
+        return None
+    
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    pool = ProcessPoolExecutor(
+        max_workers=Config.PARSE_PROCESSES,
+        mp_context=multiprocessing.get_context(method)
+    )
+    atexit.register(pool.shutdown)
+    return pool
+
 class ScraperEngine:
     """Web scraper for extracting article content"""
     
@@ -20,6 +135,8 @@ class ScraperEngine:
         self.max_content_length = Config.MAX_CONTENT_LENGTH
         self.min_content_length = Config.MIN_CONTENT_LENGTH
         self.user_agent = Config.USER_AGENT
+        self.cache_dir = Path(Config.SCRAPE_CACHE_DIR)
+        self.cache_ttl = Config.SCRAPE_CACHE_TTL
         
         # Common headers to avoid blocking
         self.headers = {
@@ -29,22 +146,100 @@ class ScraperEngine:
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
+        
+        # Pooled session so concurrent scrapes reuse TCP/TLS connections per host
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=Config.SCRAPE_CONCURRENCY,
+            pool_maxsize=Config.SCRAPE_CONCURRENCY,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Per-host semaphores keep concurrent scraping polite to each site
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self._host_slots_lock = threading.Lock()
+    
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        """Return the semaphore limiting concurrent requests to the URL's host"""
+        host = urlsplit(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.Semaphore(Config.SCRAPE_PER_HOST_LIMIT)
+                self._host_slots[host] = slot
+            return slot
+    
+    def _cache_path(self, url: str) -> Path:
+        """Path of the cache entry for a URL"""
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+    
+    def _load_cached(self, url: str) -> Optional[ScrapedArticle]:
+        """Return cached content for a URL if it is younger than the TTL"""
+        path = self._cache_path(url)
+        try:
+            if time.time() - path.stat().st_mtime > self.cache_ttl:
+                return None
+            return orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+    
+    def _store_cached(self, url: str, content: ScrapedArticle):
+        """Write content to the cache atomically (safe under concurrent scrapes)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(content))
+            os.replace(tmp_path, self._cache_path(url))
+        except OSError as e:
+            logger.warning(f"Failed to cache {url}: {str(e)}")
+    
+    def _fetch(self, url: str) -> Optional[requests.Response]:
+        """
+        Download a page through the pooled session
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Response, or None if the request failed
+        """
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            logger.error(f"Fetching {url} failed: {str(e)}")
+            return None
     
-    def scrape_with_newspaper(self, url: str) -> Optional[Dict[str, str]]:
+    def scrape_with_newspaper(self, url: str, html: Optional[bytes] = None) -> Optional[ScrapedArticle]:
         """
         Scrape content using newspaper3k library
         
         Args:
             url: URL to scrape
+            html: Already downloaded raw page bytes (fetched through the session if omitted);
+                newspaper detects their encoding itself
             
         Returns:
             Dictionary with title, text, authors, and publish_date
         """
         try:
-            logger.info(f"Scraping with newspaper3k: {url}")
+            logger.debug("Scraping with newspaper3k: %s", url)
+            
+            if html is None:
+                response = self._fetch(url)
+                if response is None:
+                    return None
+                html = response.content
             
+            # Parse HTML fetched through the shared session instead of
+            # article.download(), which opens a new connection per URL
             article = Article(url)
-            article.download()
+            article.set_html(html)
             article.parse()
             
             # Check if content is substantial
@@ -70,54 +265,34 @@ class ScraperEngine:
             logger.error(f"Newspaper3k failed for {url}: {str(e)}")
             return None
     
-    def scrape_with_beautifulsoup(self, url: str) -> Optional[Dict[str, str]]:
+    def scrape_with_beautifulsoup(self, url: str, page: Optional[bytes] = None) -> Optional[ScrapedArticle]:
         """
-        Fallback scraper using BeautifulSoup
+        Fallback scraper parsing the page directly with lxml
         
         Args:
             url: URL to scrape
+            page: Already downloaded page bytes (fetched through the session if omitted)
             
         Returns:
             Dictionary with title, text, and url
         """
         try:
-            logger.info(f"Scraping with BeautifulSoup: {url}")
+            logger.debug("Scraping with lxml: %s", url)
             
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-            
-            # Extract title
-            title = soup.find('title')
-            title = title.get_text().strip() if title else "No title"
-            
-            # Extract main content
-            content_selectors = [
-                'article', 'main', '.content', '.post-content', 
-                '.entry-content', '.article-content', '.story-body'
-            ]
-            
-            content = None
-            for selector in content_selectors:
-                content = soup.select_one(selector)
-                if content:
-                    break
+            if page is None:
+                response = self._fetch(url)
+                if response is None:
+                    return None
+                page = response.content
             
-            if not content:
-                # Fallback to body
-                content = soup.find('body')
+            # Parsing is CPU-bound; run it in a worker process to get around the GIL
+            pool = _get_parse_pool()
+            parsed = (
+                pool.submit(_parse_html, page).result(timeout=self.timeout) if pool else _parse_html(page)
+            )
             
-            if content:
-                # Extract text
-                text = content.get_text(separator=' ', strip=True)
-                
-                # Clean up extra whitespace
-                text = ' '.join(text.split())
+            if parsed:
+                title, text = parsed
                 
                 # Check length
                 if len(text) < self.min_content_length:
@@ -134,62 +309,74 @@ class ScraperEngine:
                     "authors": "Unknown",
                     "publish_date": "Unknown",
                     "url": url,
-                    "method": "beautifulsoup"
+                    "method": "lxml"
                 }
             
             return None
             
         except Exception as e:
-            logger.error(f"BeautifulSoup failed for {url}: {str(e)}")
+            logger.error(f"lxml extraction failed for {url}: {str(e)}")
             return None
     
-    def scrape_url(self, url: str) -> Optional[Dict[str, str]]:
+    def scrape_url(self, url: str) -> Optional[ScrapedArticle]:
         """
         Scrape a single URL with fallback methods
         
+        Successful results are cached on disk for Config.SCRAPE_CACHE_TTL seconds.
+        
         Args:
             url: URL to scrape
             
         Returns:
             Scraped content or None if failed
         """
-        # Try newspaper3k first
-        content = self.scrape_with_newspaper(url)
+        content = self._load_cached(url)
+        if content is not None:
+            logger.debug("Using cached content for %s", url)
+            return content
         
-        if content is None:
-            # Fallback to BeautifulSoup
-            content = self.scrape_with_beautifulsoup(url)
+        # Download once; both extractors parse the same response
+        with self._host_slot(url):
+            response = self._fetch(url)
+        
+        content = None
+        if response is not None:
+            # Try newspaper3k first
+            # Raw bytes: requests assumes ISO-8859-1 for text/html without a charset,
+            # which would garble UTF-8 pages before newspaper sees them
+            content = self.scrape_with_newspaper(url, response.content)
+            
+            if content is None:
+                # Fallback to plain lxml extraction
+                content = self.scrape_with_beautifulsoup(url, response.content)
         
         if content:
-            logger.info(f"Successfully scraped {url} using {content['method']}")
+            logger.debug("Successfully scraped %s using %s", url, content['method'])
+            self._store_cached(url, content)
         else:
             logger.warning(f"Failed to scrape {url}")
             
         return content
     
-    def scrape_multiple(self, urls: List[str], delay: float = 1.0) -> List[Dict[str, str]]:
+    def scrape_multiple(self, urls: List[str]) -> List[ScrapedArticle]:
         """
-        Scrape multiple URLs with delay between requests
+        Scrape multiple URLs concurrently
+        
+        Fetching is network-bound, so URLs are scraped on a thread pool of
+        Config.SCRAPE_CONCURRENCY workers; requests to any one host are still
+        limited to Config.SCRAPE_PER_HOST_LIMIT at a time.
         
         Args:
             urls: List of URLs to scrape
-            delay: Delay between requests in seconds
             
         Returns:
-            List of scraped content
+            List of scraped content, in the same order as urls
         """
-        results = []
+        if not urls:
+            return []
         
-        for i, url in enumerate(urls):
-            logger.info(f"Scraping {i+1}/{len(urls)}: {url}")
-            
-            content = self.scrape_url(url)
-            if content:
-                results.append(content)
-            
-            # Add delay between requests to be respectful
-            if i < len(urls) - 1:
-                time.sleep(delay)
+        with ThreadPoolExecutor(max_workers=min(Config.SCRAPE_CONCURRENCY, len(urls))) as executor:
+            results = [content for content in executor.map(self.scrape_url, urls) if content]
         
         logger.info(f"Successfully scraped {len(results)} out of {len(urls)} URLs")
-        return results
\ No newline at end of file
+        return results
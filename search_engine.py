@@ -3,22 +3,100 @@ Search Engine Module - Uses DuckDuckGo for web search (no API key needed)
 """
 import asyncio
 from typing import List, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from duckduckgo_search import DDGS
 from config import Config
 import logging
+import threading
 import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Query parameters that only track the click and never change the page content
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "ref_src"}
+
+def _is_tracking_param(key: str) -> bool:
+    """True for query parameter names that only track the click"""
+    return key.startswith("utm_") or key in TRACKING_PARAMS
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so that trivially different links to the same page compare equal
+    
+    Lowercases the scheme and host, drops the fragment, strips tracking
+    parameters (utm_*, fbclid, gclid, ref, ref_src) and sorts the remaining
+    query segments. Segments are kept byte for byte (never decoded and
+    re-encoded), but the result is only meant as a deduplication key: fetch
+    the original URL.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Canonical form of the URL
+    """
+    parts = urlsplit(url.strip())
+    query = "&".join(sorted(
+        segment for segment in parts.query.split("&")
+        if segment and not _is_tracking_param(segment.split("=", 1)[0].lower())
+    ))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+class RateLimiter:
+    """Thread-safe token bucket: callers wait only once the burst allowance is used up"""
+    
+    def __init__(self, calls: int, period: float):
+        self.capacity = max(1, calls)
+        self.interval = period / self.capacity
+        self._next_free = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self._lock:
+            now = time.monotonic()
+            # An idle bucket refills up to `capacity` immediate requests
+            start = max(self._next_free, now - (self.capacity - 1) * self.interval)
+            self._next_free = start + self.interval
+            wait = start - now
+        
+        if wait > 0:
+            time.sleep(wait)
+
+# Shared by every SearchEngine so concurrent topics respect one DuckDuckGo quota
+_ddg_limiter = RateLimiter(Config.SEARCH_RATE_LIMIT_CALLS, Config.SEARCH_RATE_LIMIT_PERIOD)
+
+# DDGS keeps per-client session state and is not documented as thread-safe,
+# so each thread reuses its own client (and with it the HTTP session and cookies)
+_ddgs_local = threading.local()
+
+def _get_ddgs() -> DDGS:
+    """Return the calling thread's DDGS client, creating it on first use"""
+    client = getattr(_ddgs_local, "client", None)
+    if client is None:
+        client = _ddgs_local.client = DDGS()
+    return client
+
+@lru_cache(maxsize=None)
+def _get_search_pool() -> ThreadPoolExecutor:
+    """Return the shared pool that runs news searches alongside web searches"""
+    return ThreadPoolExecutor(max_workers=Config.TOPIC_CONCURRENCY, thread_name_prefix="search")
+
 class SearchEngine:
     """Web search engine using DuckDuckGo"""
     
     def __init__(self):
-        self.ddgs = DDGS()
         self.max_results = Config.MAX_SEARCH_RESULTS
         self.timeout = Config.SEARCH_TIMEOUT
     
+    @property
+    def ddgs(self) -> DDGS:
+        """DuckDuckGo client for the calling thread"""
+        return _get_ddgs()
+    
     def search(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, str]]:
         """
         Search for a topic using DuckDuckGo
@@ -38,14 +116,15 @@ class SearchEngine:
             
             # Perform the search
             results = []
-            search_results = self.ddgs.text(
+            _ddg_limiter.acquire()
+            # Materialize now (older DDGS versions return lazy generators)
+            search_results = list(self.ddgs.text(
                 query,
                 region='wt-wt',
                 safesearch='moderate',
                 timelimit=None,
                 max_results=max_results
-            )
-            time.sleep(2)  # Add delay after search request
+            ))
             
             for result in search_results:
                 formatted_result = {
@@ -80,14 +159,14 @@ class SearchEngine:
             logger.info(f"Searching news for: {query}")
             
             results = []
-            news_results = self.ddgs.news(
+            _ddg_limiter.acquire()
+            news_results = list(self.ddgs.news(
                 query,
                 region='wt-wt',
                 safesearch='moderate',
                 timelimit='m',  # Last month
                 max_results=max_results
-            )
-            time.sleep(2)  # Add delay after news search request
+            ))
             
             for result in news_results:
                 formatted_result = {
@@ -124,13 +203,28 @@ class SearchEngine:
         web_results = max_results // 2
         news_results = max_results - web_results
         
-        # Get both types of results
+        # Get both types of results concurrently
+        news_future = _get_search_pool().submit(self.search_news, query, news_results)
         web_data = self.search(query, web_results)
-        time.sleep(2)  # Add delay between web and news search
-        news_data = self.search_news(query, news_results)
+        news_data = news_future.result()
+        
+        # Combine, dropping news hits that point at pages already found by the web search
+        combined_results = []
+        seen_urls = set()
+        for result in web_data + news_data:
+            # The original href is kept for scraping and the report; the canonical
+            # form is only the dedup key
+            url = canonicalize_url(result["href"]) if result.get("href") else ""
+            if url and url in seen_urls:
+                continue
+            seen_urls.add(url)
+            result["canonical_href"] = url
+            combined_results.append(result)
         
-        # Combine and return
-        combined_results = web_data + news_data
-        logger.info(f"Combined search returned {len(combined_results)} total results")
+        duplicates = len(web_data) + len(news_data) - len(combined_results)
+        logger.info(
+            f"Combined search returned {len(combined_results)} total results "
+            f"({duplicates} duplicates removed)"
+        )
         
         return combined_results
\ No newline at end of file
@@ -2,7 +2,7 @@
 Setup script for Web Knowledge Aggregator Agent
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 from pathlib import Path
 
 # Read the README file
@@ -28,6 +28,8 @@ else:
         "streamlit>=1.29.0",
         "pydantic>=2.5.0",
         "tiktoken>=0.5.2",
+        "orjson>=3.9.0",
+        "zstandard>=0.22.0",
     ]
 
 setup(
@@ -39,12 +41,13 @@ setup(
     author="Your Name",
     author_email="your.email@example.com",
     url="https://github.com/yourusername/web-knowledge-aggregator",
-    packages=find_packages(),
+    packages=[],  # Flat layout: everything ships via py_modules, no package discovery walk
     py_modules=[
         "config",
         "search_engine",
         "scraper_engine",
         "summarizer",
+        "distiller",
         "output_writer",
         "aggregator",
         "main",
@@ -2,9 +2,10 @@
 Streamlit Web Interface for Web Knowledge Aggregator Agent
 """
 import streamlit as st
-import json
+import orjson
 from datetime import datetime
 import os
+import heapq
 from pathlib import Path
 import time
 
@@ -62,8 +63,27 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_aggregator():
+    """Aggregator shared across reruns and sessions, so clients and caches are built once"""
+    return KnowledgeAggregator()
+
+@st.cache_data(show_spinner=False)
+def _read_report(path: str, mtime: float, size: int) -> str:
+    """Read a report once per file version (mtime and size are part of the cache key)"""
+    return Path(path).read_text(encoding="utf-8")
+
+def load_report(path):
+    """Return a report's content through the read cache, or None if the file is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return _read_report(str(path), stat.st_mtime, stat.st_size)
+
+@st.cache_data(ttl=60)
 def check_configuration():
-    """Check if the system is properly configured"""
+    """Check if the system is properly configured (cached briefly; called from sidebar and main)"""
     if not Config.AZURE_OPENAI_API_KEY:
         return False, "Azure OpenAI API Key is not configured"
     if not Config.AZURE_OPENAI_ENDPOINT:
@@ -86,7 +106,7 @@ def display_system_status():
     st.sidebar.subheader("⚙️ Settings")
     st.sidebar.write(f"**Max Search Results:** {Config.MAX_SEARCH_RESULTS}")
     st.sidebar.write(f"**Scraping Timeout:** {Config.SCRAPING_TIMEOUT}s")
-    st.sidebar.write(f"**Chunk Size:** {Config.CHUNK_SIZE}")
+    st.sidebar.write(f"**Chunk Size:** {Config.CHUNK_SIZE} tokens")
     st.sidebar.write(f"**Max Summary Length:** {Config.MAX_SUMMARY_LENGTH}")
     
     # Output directory
@@ -96,27 +116,42 @@ def display_system_status():
     # Display recent reports
     display_recent_reports()
 
+@st.cache_data(ttl=5, show_spinner=False)
+def _recent_reports(output_dir: str, limit: int = 5):
+    """
+    Find the newest Markdown reports with a single directory scan
+    
+    Returns:
+        List of (file name, mtime) pairs, newest first, or None if the directory is missing
+    """
+    try:
+        with os.scandir(output_dir) as entries:
+            reports = [
+                (entry.name, entry.stat(follow_symlinks=False).st_mtime)
+                for entry in entries
+                if entry.name.endswith('.md') and entry.is_file(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        return None
+    
+    return heapq.nlargest(limit, reports, key=lambda report: report[1])
+
 def display_recent_reports():
     """Display recent reports in sidebar"""
     st.sidebar.subheader("📄 Recent Reports")
     
-    if Config.OUTPUT_DIR.exists():
-        # Get recent .md files
-        md_files = sorted(
-            [f for f in Config.OUTPUT_DIR.glob("*.md")],
-            key=lambda x: x.stat().st_mtime,
-            reverse=True
-        )[:5]  # Show last 5 reports
-        
-        if md_files:
-            for file in md_files:
-                file_time = datetime.fromtimestamp(file.stat().st_mtime)
-                st.sidebar.write(f"📄 {file.name}")
-                st.sidebar.caption(f"Generated: {file_time.strftime('%Y-%m-%d %H:%M')}")
-        else:
-            st.sidebar.info("No reports generated yet")
-    else:
+    # Show last 5 reports
+    md_files = _recent_reports(str(Config.OUTPUT_DIR))
+    
+    if md_files is None:
         st.sidebar.info("Output directory not found")
+    elif md_files:
+        for name, mtime in md_files:
+            file_time = datetime.fromtimestamp(mtime)
+            st.sidebar.write(f"📄 {name}")
+            st.sidebar.caption(f"Generated: {file_time.strftime('%Y-%m-%d %H:%M')}")
+    else:
+        st.sidebar.info("No reports generated yet")
 
 def main():
     """Main Streamlit application"""
@@ -243,8 +278,8 @@ def multiple_topic_interface():
 def process_single_topic(topic, max_results, custom_filename, include_json):
     """Process a single topic with progress tracking"""
     
-    # Initialize aggregator
-    aggregator = KnowledgeAggregator()
+    # Reuse the cached aggregator
+    aggregator = get_aggregator()
     
     # Progress tracking
     progress_bar = st.progress(0)
@@ -273,14 +308,16 @@ def process_single_topic(topic, max_results, custom_filename, include_json):
         status_text.text("📝 Generating report...")
         progress_bar.progress(90)
         
-        report_path = aggregator.generate_report(summary_data, custom_filename)
+        # Render once: the same Markdown is written to disk and offered for download
+        report_markdown = aggregator.output_writer.generate_markdown_report(summary_data)
+        report_path = aggregator.generate_report(summary_data, custom_filename, content=report_markdown)
         
         # Complete
         progress_bar.progress(100)
         status_text.text("✅ Processing completed!")
         
         # Display results
-        display_results(summary_data, report_path, include_json)
+        display_results(summary_data, report_path, include_json, report_markdown)
         
     except Exception as e:
         st.error(f"Processing failed: {str(e)}")
@@ -289,30 +326,27 @@ def process_single_topic(topic, max_results, custom_filename, include_json):
 def process_multiple_topics(topics, max_results, include_json):
     """Process multiple topics with progress tracking"""
     
-    # Initialize aggregator
-    aggregator = KnowledgeAggregator()
+    # Reuse the cached aggregator
+    aggregator = get_aggregator()
     
     # Progress tracking
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    results = []
-    
-    for i, topic in enumerate(topics):
-        try:
-            status_text.text(f"🔍 Processing topic {i+1}/{len(topics)}: {topic}")
-            progress_bar.progress((i * 100) // len(topics))
-            
-            result = aggregator.process_topic(topic, max_results)
-            results.append(result)
-            
-        except Exception as e:
-            st.error(f"Failed to process '{topic}': {str(e)}")
-            results.append({
-                "topic": topic,
-                "status": "failed",
-                "error": str(e)
-            })
+    completed = []
+    status_text.text(f"🔍 Processing {len(topics)} topics...")
+    
+    def on_result(result):
+        """Update progress as each topic finishes (called on this script thread)"""
+        completed.append(result)
+        progress_bar.progress((len(completed) * 100) // len(topics))
+        status_text.text(f"🔍 Finished {len(completed)}/{len(topics)}: {result['topic']}")
+        
+        if result.get('status') == 'failed':
+            st.error(f"Failed to process '{result['topic']}': {result.get('error', 'Unknown error')}")
+    
+    # Topics run concurrently inside the aggregator; results come back in input order
+    results = aggregator.process_multiple_topics(topics, max_results, on_result=on_result)
     
     # Complete
     progress_bar.progress(100)
@@ -321,8 +355,8 @@ def process_multiple_topics(topics, max_results, include_json):
     # Display results
     display_multiple_results(results, include_json)
 
-def display_results(summary_data, report_path, include_json):
-    """Display results for a single topic"""
+def display_results(summary_data, report_path, include_json, report_markdown=None):
+    """Display results for a single topic (report_markdown avoids reading the report back from disk)"""
     
     st.markdown("---")
     st.header("📊 Results")
@@ -343,10 +377,8 @@ def display_results(summary_data, report_path, include_json):
     st.subheader("📥 Download Reports")
     
     # Markdown report
-    if os.path.exists(report_path):
-        with open(report_path, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
-        
+    markdown_content = report_markdown if report_markdown is not None else load_report(report_path)
+    if markdown_content is not None:
         st.download_button(
             label="📄 Download Markdown Report",
             data=markdown_content,
@@ -356,7 +388,7 @@ def display_results(summary_data, report_path, include_json):
     
     # JSON backup
     if include_json:
-        json_data = json.dumps(summary_data, indent=2, ensure_ascii=False)
+        json_data = orjson.dumps(summary_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
         st.download_button(
             label="📋 Download JSON Backup",
             data=json_data,
@@ -416,10 +448,8 @@ def display_multiple_results(results, include_json):
                 st.write(f"📊 Articles processed: {result['total_articles']}")
                 
                 # Download button
-                if os.path.exists(result['report_path']):
-                    with open(result['report_path'], 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
+                content = load_report(result['report_path'])
+                if content is not None:
                     st.download_button(
                         label="📄 Download Report",
                         data=content,
@@ -1,9 +1,22 @@
 """
 Summarizer Module - Uses LangChain with Azure OpenAI for content summarization
 """
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, Iterable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from importlib.util import find_spec
+from pathlib import Path
+import contextlib
+import hashlib
+import io
 import logging
+import os
+import tempfile
+import threading
+import orjson
 from config import Config
+from distiller import ContentFilter, Distiller, count_tokens, drop_near_duplicates, split_tokens, top_relevant, truncate_tokens
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,89 +24,256 @@ logger = logging.getLogger(__name__)
 # Global variable for LangChain availability
 LANGCHAIN_AVAILABLE = False
 
-# Try to import LangChain components, with fallback
-try:
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-    from langchain_openai import AzureOpenAI
-    from langchain.chains.summarize import load_summarize_chain
-    from langchain_core.documents import Document
-    from langchain_core.prompts import PromptTemplate
-    LANGCHAIN_AVAILABLE = True
-    logger.info("LangChain components imported successfully")
-except ImportError as e:
-    logger.warning(f"LangChain not available: {e}")
+# Only check that LangChain is installed; its (heavy) modules are imported where they
+# are first used, so importing this module stays cheap for the CLI and Streamlit.
+# A broken install is still caught when the Summarizer initializes.
+_missing_packages = [name for name in ("langchain", "langchain_openai", "langchain_core") if find_spec(name) is None]
+if _missing_packages:
+    logger.warning(f"LangChain not available: missing {', '.join(_missing_packages)}")
     logger.warning("Summarizer will use fallback methods")
+else:
+    LANGCHAIN_AVAILABLE = True
+
+# Static instructions shared by every article-level prompt. They come first so that
+# all summarization requests start with an identical prefix, which Azure OpenAI can
+# serve from its prompt cache; article-specific fields always come last.
+SUMMARY_INSTRUCTIONS = """You are summarizing web articles for a research report.
+Please provide a comprehensive summary of the article content below.
+Focus on key insights, main arguments, and important facts.
+Keep the summary concise but informative.
+Write plain prose without headings and do not add facts that are not in the content."""
+
+SUMMARY_TEMPLATE = SUMMARY_INSTRUCTIONS + """
+
+Article Title: {title}
+URL: {url}
+
+Content:
+{text}
+
+Summary:"""
+
+# Map step of the chunked (map-reduce) path, sharing the same prefix
+CHUNK_SUMMARY_TEMPLATE = SUMMARY_INSTRUCTIONS + """
+
+Content:
+{text}
+
+Summary:"""
+
+# Topic-level reduce step: the static instructions lead here too, the topic and
+# summaries follow
+FINAL_INSIGHTS_TEMPLATE = """You are writing the conclusions of a research report from article summaries.
+Provide key insights and conclusions about the topic below.
+Identify common themes, contradictions, and important takeaways.
+Format as bullet points with clear, actionable insights.
+
+Topic: {topic}
+
+Article Summaries:
+{summaries}
+
+Key Insights:"""
+
+@lru_cache(maxsize=None)
+def _prompt_overhead() -> int:
+    """
+    Tokens the summary prompt spends on instructions and article metadata
+    
+    Computed on first use rather than at import: counting tokens loads the
+    tiktoken encoding, which may have to be downloaded.
+    """
+    return count_tokens(SUMMARY_TEMPLATE) + 64
+
+@lru_cache(maxsize=None)
+def _get_llm(deployment_name: str, temperature: float, max_tokens: int):
+    """
+    Return a shared Azure OpenAI chat client for the given settings
+    
+    Chat completions are the API modern deployments (gpt-35-turbo, gpt-4o)
+    serve; the legacy completions endpoint is not available for them.
+    Reusing one client across Summarizer instances keeps its HTTP connections
+    alive between topics instead of paying a new TLS handshake each time.
+    Rate-limited (429), transient server errors and timed-out requests are
+    retried by the client with exponential backoff before any local fallback.
+    """
+    from langchain_openai import AzureChatOpenAI
+    
+    return AzureChatOpenAI(
+        azure_endpoint=Config.AZURE_OPENAI_ENDPOINT,
+        api_key=Config.AZURE_OPENAI_API_KEY,
+        api_version=Config.AZURE_OPENAI_API_VERSION,
+        azure_deployment=deployment_name,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        max_retries=Config.LLM_MAX_RETRIES,
+        timeout=Config.LLM_TIMEOUT
+    )
+
+# Article summaries keyed by the hash of the text sent to the LLM, shared by all
+# Summarizer instances so syndicated copies of an article are only paid for once.
+# Entries are also persisted under Config.SUMMARY_CACHE_DIR, so repeated runs (and
+# Streamlit reruns) of a topic skip the LLM entirely.
+_summary_cache: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+# Changing the prompts or the model settings invalidates previously cached summaries
+_PROMPT_VERSION = hashlib.sha256("\0".join([
+    SUMMARY_TEMPLATE,
+    CHUNK_SUMMARY_TEMPLATE,
+    str(Config.AZURE_OPENAI_DEPLOYMENT_NAME),
+    str(Config.MAX_SUMMARY_LENGTH),
+    str(Config.CHUNK_SIZE),
+    str(Config.LONG_DOC_STRATEGY),
+    str(Config.CONTEXT_WINDOW),
+]).encode('utf-8')).hexdigest()[:16]
+
+def _summary_key(text: str) -> str:
+    """Cache key for a summarization input"""
+    return hashlib.sha256(f"{_PROMPT_VERSION}\0{text}".encode('utf-8')).hexdigest()
+
+def _summary_path(key: str) -> Path:
+    """Path of the persistent cache entry for a key"""
+    return Path(Config.SUMMARY_CACHE_DIR) / f"{key}.json"
+
+def _get_cached_summary(key: str) -> Optional[Tuple[str, str]]:
+    """Return a cached (summary, method) pair and mark it as recently used"""
+    with _summary_cache_lock:
+        cached = _summary_cache.get(key)
+        if cached is not None:
+            _summary_cache.move_to_end(key)
+            return cached
+    
+    try:
+        entry = orjson.loads(_summary_path(key).read_bytes())
+        cached = (entry["summary"], entry["method"])
+    except (OSError, KeyError, TypeError, orjson.JSONDecodeError):
+        return None
+    
+    _remember_summary(key, cached)
+    return cached
+
+def _remember_summary(key: str, cached: Tuple[str, str]):
+    """Store a summary in memory, evicting the least recently used one"""
+    with _summary_cache_lock:
+        _summary_cache[key] = cached
+        _summary_cache.move_to_end(key)
+        while len(_summary_cache) > Config.SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+def _cache_summary(key: str, summary: str, method: str):
+    """Store a summary in memory and on disk (written atomically)"""
+    _remember_summary(key, (summary, method))
+    
+    try:
+        cache_dir = Path(Config.SUMMARY_CACHE_DIR)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps({"summary": summary, "method": method}))
+        os.replace(tmp_path, _summary_path(key))
+    except OSError as e:
+        logger.warning(f"Failed to persist summary cache entry: {str(e)}")
 
 class Summarizer:
     """Content summarizer using LangChain and Azure OpenAI (with fallback)"""
     
     def __init__(self):
-        global LANGCHAIN_AVAILABLE
         self.chunk_size = Config.CHUNK_SIZE
         self.chunk_overlap = Config.CHUNK_OVERLAP
         self.max_summary_length = Config.MAX_SUMMARY_LENGTH
+        self.distiller = Distiller()
+        self.long_doc_strategy = Config.LONG_DOC_STRATEGY
+        
+        # Per instance: a failed initialization only disables AI for this summarizer
+        self._use_langchain = LANGCHAIN_AVAILABLE
         
         # Initialize LangChain components if available
-        if LANGCHAIN_AVAILABLE:
+        if self._use_langchain:
             try:
-                # Initialize Azure OpenAI
-                self.llm = AzureOpenAI(
-                    azure_endpoint=Config.AZURE_OPENAI_ENDPOINT,
-                    api_key=Config.AZURE_OPENAI_API_KEY,
-                    api_version=Config.AZURE_OPENAI_API_VERSION,
-                    deployment_name=Config.AZURE_OPENAI_DEPLOYMENT_NAME,
-                    temperature=0.3,
-                    max_tokens=self.max_summary_length
-                )
+                from langchain_core.prompts import PromptTemplate
                 
-                # Initialize text splitter
-                self.text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=self.chunk_size,
-                    chunk_overlap=self.chunk_overlap,
-                    length_function=len,
+                # Initialize Azure OpenAI (shared across instances)
+                self.llm = _get_llm(
+                    Config.AZURE_OPENAI_DEPLOYMENT_NAME,
+                    0.3,
+                    self.max_summary_length
                 )
                 
                 # Custom prompts
                 self.summary_prompt = PromptTemplate(
-                    template="""
-                    Please provide a comprehensive summary of the following article content.
-                    Focus on key insights, main arguments, and important facts.
-                    Keep the summary concise but informative.
-                    
-                    Article Title: {title}
-                    URL: {url}
-                    
-                    Content:
-                    {text}
-                    
-                    Summary:
-                    """,
+                    template=SUMMARY_TEMPLATE,
                     input_variables=["title", "url", "text"]
                 )
                 
+                self.chunk_summary_prompt = PromptTemplate(
+                    template=CHUNK_SUMMARY_TEMPLATE,
+                    input_variables=["text"]
+                )
+                
                 self.final_insights_prompt = PromptTemplate(
-                    template="""
-                    Based on the following article summaries about "{topic}", provide key insights and conclusions.
-                    Identify common themes, contradictions, and important takeaways.
-                    Format as bullet points with clear, actionable insights.
-                    
-                    Article Summaries:
-                    {summaries}
-                    
-                    Key Insights:
-                    """,
+                    template=FINAL_INSIGHTS_TEMPLATE,
                     input_variables=["topic", "summaries"]
                 )
                 
+                # Raw template strings for the per-call hot paths: str.format_map skips
+                # PromptTemplate's per-call validation (the objects are kept for chains)
+                self._summary_tmpl = self.summary_prompt.template
+                self._final_insights_tmpl = self.final_insights_prompt.template
+                
                 logger.info("LangChain summarizer initialized successfully")
                 
             except Exception as e:
                 logger.error(f"Failed to initialize LangChain summarizer: {e}")
-                LANGCHAIN_AVAILABLE = False
+                self._use_langchain = False
         
-        if not LANGCHAIN_AVAILABLE:
+        if not self._use_langchain:
             logger.info("Using fallback summarizer (no AI capabilities)")
     
+    @cached_property
+    def summarize_chain(self):
+        """Summarize chain for long articles ("refine" or "map_reduce"), built once per instance"""
+        from langchain.chains.summarize import load_summarize_chain
+        
+        if self.long_doc_strategy == "refine":
+            # One call per chunk, each refining the running summary (no separate reduce call)
+            return load_summarize_chain(
+                self.llm,
+                chain_type="refine",
+                question_prompt=self.chunk_summary_prompt,
+                verbose=False
+            )
+        
+        return load_summarize_chain(
+            self.llm,
+            chain_type="map_reduce",
+            map_prompt=self.chunk_summary_prompt,
+            verbose=False
+        )
+    
+    @cached_property
+    def max_input_tokens(self) -> int:
+        """Article tokens that can still influence the summary; anything beyond is never read"""
+        return max(1, Config.CONTEXT_WINDOW - self.max_summary_length - _prompt_overhead())
+    
+    @cached_property
+    def long_doc_chunk_tokens(self) -> int:
+        """
+        Tokens per chunk when a text is split for the summarize chain
+        
+        A refine step only carries the running summary next to its chunk, so its
+        chunks are widened to whatever the context window leaves for them: fewer,
+        fuller steps and therefore fewer sequential LLM calls.
+        """
+        if self.long_doc_strategy == "refine":
+            return max(self.chunk_size, self.max_input_tokens - self.max_summary_length)
+        return self.chunk_size
+    
+    @cached_property
+    def chunk_distiller(self) -> Distiller:
+        """Distiller that cuts long texts down to a single prompt (extract_then_stuff)"""
+        return Distiller(self.chunk_size)
+    
     def _simple_summary(self, text: str, max_length: int = 500) -> str:
         """
         Simple text summarization (fallback when LangChain is not available)
@@ -105,8 +285,8 @@ class Summarizer:
         Returns:
             Simple summary
         """
-        # Simple approach: take first few sentences
-        sentences = text.split('. ')
+        # Simple approach: take first few sentences (maxsplit stops scanning after the third)
+        sentences = text.split('. ', 3)
         summary = '. '.join(sentences[:3]) + '.'
         
         if len(summary) > max_length:
@@ -124,11 +304,10 @@ class Summarizer:
         Returns:
             Dictionary with original article info plus summary
         """
-        global LANGCHAIN_AVAILABLE
         try:
-            logger.info(f"Summarizing article: {article['title']}")
+            logger.debug("Summarizing article: %s", article['title'])
             
-            if not LANGCHAIN_AVAILABLE:
+            if not self._use_langchain:
                 # Use simple fallback
                 summary = self._simple_summary(article['text'], self.max_summary_length)
                 return {
@@ -137,40 +316,66 @@ class Summarizer:
                     "method": "simple_fallback"
                 }
             
-            # Use LangChain summarization
-            text = article['text']
+            # Use LangChain summarization on the distilled text (top sentences within
+            # the token budget) rather than the full scraped body
+            text = article.get('distilled_text') or self.distiller.distill(article['text'])
+            
+            # Trim to what fits the model's context before any chunking
+            text = truncate_tokens(text, self.max_input_tokens)
+            
+            # Identical text (e.g. a syndicated copy) was already summarized
+            cache_key = _summary_key(text)
+            cached = _get_cached_summary(cache_key)
+            if cached is not None:
+                logger.debug("Reusing cached summary for: %s", article['title'])
+                summary, method = cached
+                return {
+                    **article,
+                    "distilled_text": text,
+                    "summary": summary,
+                    "method": method
+                }
+            
+            # Token-sized chunks from a single encoding pass (one chunk means the text fits)
+            chunks = split_tokens(text, self.long_doc_chunk_tokens, self.chunk_overlap)
+            
+            method = "langchain"
+            if len(chunks) > 1 and self.long_doc_strategy == "extract_then_stuff":
+                # Keep the most informative sentences that fit one prompt: a single LLM call
+                text = self.chunk_distiller.distill(text)
+                chunks = [text]
+                method = "langchain_extracted"
             
             # If text is short enough, summarize directly
-            if len(text) <= self.chunk_size:
-                prompt = self.summary_prompt.format(
-                    title=article['title'],
-                    url=article['url'],
-                    text=text
-                )
+            if len(chunks) == 1:
+                prompt = self._summary_tmpl.format_map({
+                    "title": article['title'],
+                    "url": article['url'],
+                    "text": text
+                })
                 
-                summary = self.llm(prompt)
+                summary = self.llm.invoke(prompt).content.strip()
+                _cache_summary(cache_key, summary, method)
                 
                 return {
                     **article,
-                    "summary": summary.strip(),
-                    "method": "langchain"
+                    "distilled_text": text,
+                    "summary": summary,
+                    "method": method
                 }
             
             # For longer texts, use chunking
-            docs = self.text_splitter.create_documents([text])
+            from langchain_core.documents import Document
             
-            # Load summarize chain
-            chain = load_summarize_chain(
-                self.llm,
-                chain_type="map_reduce",
-                verbose=False
-            )
+            docs = [Document(page_content=chunk) for chunk in chunks]
             
-            summary = chain.run(docs)
+            summary = self.summarize_chain.run(docs).strip()
+            _cache_summary(cache_key, summary, "langchain_chunked")
             
             return {
                 **article,
-                "summary": summary.strip(),
+                "distilled_text": text,
+                "summary": summary,
                 "method": "langchain_chunked"
             }
             
@@ -184,24 +389,47 @@ class Summarizer:
                 "method": "error_fallback"
             }
     
-    def summarize_multiple_articles(self, articles: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    def summarize_multiple_articles(self, articles: Iterable[Dict[str, str]],
+                                    llm_slots: Optional[threading.Semaphore] = None) -> List[Dict[str, str]]:
         """
         Summarize multiple articles
         
+        Articles may be a list or any iterable, e.g. a generator yielding pages
+        as they finish downloading: each admitted article is submitted at once,
+        so its LLM call overlaps the arrival of the next. Short articles and
+        copies of earlier ones are skipped (see ContentFilter). Articles are
+        summarized concurrently on a thread pool bounded by Config.LLM_CONCURRENCY;
+        each is an independent request, so a failure only sends that one article
+        to the fallback. The local fallback summarizer runs inline.
+        
         Args:
-            articles: List of article dictionaries
+            articles: Article dictionaries
+            llm_slots: Optional semaphore shared with other pipelines; one slot is
+                held per article being summarized
             
         Returns:
-            List of articles with summaries added
+            List of articles with summaries added, in arrival order
         """
-        summarized_articles = []
+        content_filter = ContentFilter()
+        admitted = (article for article in articles if content_filter.admit(article.get('text', '')))
         
-        for i, article in enumerate(articles):
-            logger.info(f"Summarizing article {i+1}/{len(articles)}")
-            
-            summarized_article = self.summarize_single_article(article)
-            if summarized_article:
-                summarized_articles.append(summarized_article)
+        slots = llm_slots or contextlib.nullcontext()
+        
+        def summarize_one(article):
+            with slots:
+                return self.summarize_single_article(article)
+        
+        if not self._use_langchain:
+            # Nothing to overlap: the fallback summarizer is local and CPU-bound
+            results = list(map(summarize_one, admitted))
+        else:
+            # Chat completions take one conversation per request, so every article
+            # is its own pool task holding its own slot
+            with ThreadPoolExecutor(max_workers=Config.LLM_CONCURRENCY) as executor:
+                futures = [executor.submit(summarize_one, article) for article in admitted]
+                results = [future.result() for future in futures]
+        
+        summarized_articles = [summarized_article for summarized_article in results if summarized_article]
         
         logger.info(f"Successfully summarized {len(summarized_articles)} articles")
         return summarized_articles
@@ -217,11 +445,10 @@ class Summarizer:
         Returns:
             Final insights string
         """
-        global LANGCHAIN_AVAILABLE
         try:
             logger.info("Generating final insights")
             
-            if not LANGCHAIN_AVAILABLE:
+            if not self._use_langchain:
                 # Simple fallback insights
                 insights = f"Analysis of {len(summarized_articles)} articles about '{topic}':\n\n"
                 insights += "Key findings:\n"
@@ -231,21 +458,48 @@ class Summarizer:
                 return insights
             
             # Use LangChain for insights
-            # Combine all summaries
-            summaries_text = "\n\n".join([
-                f"Article: {article['title']}\nSource: {article['url']}\nSummary: {article['summary']}"
-                for article in summarized_articles
-            ])
+            # Distinct articles can still share a summary (same distilled text, one cache entry);
+            # repeating it would only spend prompt tokens
+            candidates = drop_near_duplicates(summarized_articles, Config.NEAR_DUPLICATE_THRESHOLD, 'summary')
+            
+            # Only the summaries most relevant to the topic compete for the prompt budget
+            keep = top_relevant(topic, [f"{a['title']} {a['summary']}" for a in candidates],
+                                Config.INSIGHTS_TOP_K)
+            selected = [candidates[i] for i in keep]
+            
+            # When all summaries would overflow the prompt, shorten each one evenly
+            # instead of leaving whole articles out
+            summaries = [article['summary'] for article in selected]
+            if sum(count_tokens(summary) for summary in summaries) > Config.INSIGHTS_MAX_TOKENS:
+                per_article = max(1, Config.INSIGHTS_MAX_TOKENS // len(summaries))
+                summaries = [truncate_tokens(summary, per_article) for summary in summaries]
+            
+            # Combine all summaries into one buffer. Articles are referenced by number:
+            # the insights never cite URLs, which cost dozens of tokens each
+            buffer = io.StringIO()
+            for i, (article, summary) in enumerate(zip(selected, summaries), 1):
+                if i > 1:
+                    buffer.write("\n\n")
+                buffer.write(f"[{i}] {article['title']}\n{summary}")
+            summaries_text = buffer.getvalue()
             
             # Generate insights
-            prompt = self.final_insights_prompt.format(
-                topic=topic,
-                summaries=summaries_text
-            )
+            prompt = self._final_insights_tmpl.format_map({
+                "topic": topic,
+                "summaries": summaries_text
+            })
             
-            insights = self.llm(prompt)
+            # The rendered prompt is the key: same topic and summaries, same insights
+            cache_key = _summary_key(prompt)
+            cached = _get_cached_summary(cache_key)
+            if cached is not None:
+                logger.info("Reusing cached insights")
+                return cached[0]
             
-            return insights.strip()
+            insights = self.llm.invoke(prompt).content.strip()
+            _cache_summary(cache_key, insights, "langchain_insights")
+            
+            return insights
             
         except Exception as e:
             logger.error(f"Final insights generation failed: {str(e)}")
@@ -273,6 +527,19 @@ class Summarizer:
         # Summarize individual articles
         summarized_articles = self.summarize_multiple_articles(articles)
         
+        return self.compile_topic_summary(topic, summarized_articles)
+    
+    def compile_topic_summary(self, topic: str, summarized_articles: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Generate final insights for already summarized articles
+        
+        Args:
+            topic: The search topic
+            summarized_articles: List of articles with summaries
+            
+        Returns:
+            Dictionary with summarized articles and final insights
+        """
         # Generate final insights
         final_insights = self.generate_final_insights(topic, summarized_articles)
         
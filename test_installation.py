@@ -5,6 +5,7 @@ Test script to verify Web Knowledge Aggregator installation
 
 import sys
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 def test_imports():
@@ -25,6 +26,9 @@ def test_imports():
         import summarizer
         print("✅ summarizer module imported successfully")
         
+        import distiller
+        print("✅ distiller module imported successfully")
+        
         import output_writer
         print("✅ output_writer module imported successfully")
         
@@ -52,6 +56,7 @@ def test_dependencies():
         ("bs4", "BeautifulSoup HTML parsing"),
         ("requests", "HTTP requests"),
         ("dotenv", "Environment variable management"),
+        ("orjson", "Fast JSON serialization"),
     ]
     
     failed_imports = []
@@ -68,14 +73,16 @@ def test_dependencies():
     optional_deps = [
         ("streamlit", "Streamlit web UI"),
         ("tiktoken", "Token counting"),
+        ("zstandard", "Compressed JSON backups"),
     ]
     
+    # Only check that optional packages are installed: importing streamlit alone
+    # takes seconds and nothing else in this script uses it
     print("\n🔍 Testing optional dependencies...")
     for module, description in optional_deps:
-        try:
-            __import__(module)
-            print(f"✅ {module} ({description}) imported successfully")
-        except ImportError:
+        if find_spec(module) is not None:
+            print(f"✅ {module} ({description}) installed")
+        else:
             print(f"⚠️ {module} ({description}) not installed (optional)")
     
     return len(failed_imports) == 0
@@ -104,12 +111,11 @@ def test_configuration():
                 print(f"❌ Configuration attribute {attr} missing")
                 return False
         
-        # Test output directory creation
+        # Output directory is created on first report write
         if Config.OUTPUT_DIR.exists():
-            print(f"✅ Output directory created: {Config.OUTPUT_DIR}")
+            print(f"✅ Output directory exists: {Config.OUTPUT_DIR}")
         else:
-            print(f"❌ Output directory not created: {Config.OUTPUT_DIR}")
-            return False
+            print(f"ℹ️ Output directory will be created on first report: {Config.OUTPUT_DIR}")
         
         return True
         
@@ -187,41 +193,33 @@ def test_cli_interface():
     """Test CLI interface"""
     print("\n🔍 Testing CLI interface...")
     
+    # Run the entry point in this process: the modules are already imported, so
+    # there is no interpreter startup or dependency import to pay again
+    import contextlib
+    import io
+    import main as cli
+    
     try:
-        import subprocess
-        
-        # Test help command
-        result = subprocess.run(
-            [sys.executable, "main.py", "--help"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
-            print("✅ CLI help command works")
-        else:
-            print(f"❌ CLI help command failed: {result.stderr}")
-            return False
+        # Test help command (argparse exits after printing it)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli.main(["--help"])
+        except SystemExit as e:
+            if e.code not in (0, None):
+                print(f"❌ CLI help command failed with exit code {e.code}")
+                return False
+        print("✅ CLI help command works")
         
         # Test status command
-        result = subprocess.run(
-            [sys.executable, "main.py", "--status"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli.main(["--status"])
             print("✅ CLI status command works")
-        else:
-            print(f"⚠️ CLI status command failed (might be due to missing Azure OpenAI config): {result.stderr}")
+        except (Exception, SystemExit) as e:
+            print(f"⚠️ CLI status command failed (might be due to missing Azure OpenAI config): {e}")
         
         return True
         
-    except subprocess.TimeoutExpired:
-        print("❌ CLI test timed out")
-        return False
     except Exception as e:
         print(f"❌ CLI test failed: {e}")
         return False